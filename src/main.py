@@ -21,7 +21,7 @@
     Each router is connected to other routers which are its nieghbors.
     Each machine is connected to one router which is its gateway.
 
-    Then using the Bellman-Ford algorithm, we can setup the routing tables for each router.
+    Then running the Dijkstra algorithm from each destination, we can setup the routing tables for each router.
     Going from the routing tables, we can find paths from one machine to another.
 
 
@@ -31,7 +31,7 @@
         "type": "router",
         "interfaces": [string],
         "nieghbors": [(router_id:int, cost:int)],
-        "routing_table": dict[int, [int]]  #  mapping id of dist router to a list of best (routers(ids), total_cost) tuples to follow.
+        "routing_table": dict[int, [int]]  #  mapping id of dist router to the best (next_hop_id, total_cost) tuple first, then at most one fallback tuple.
     }
 
     A machine will be represented by a dictionnary: 
@@ -51,6 +51,23 @@
 
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from threading import Lock
+from typing import Final
+
+import numpy as np
+from numba import njit, prange
+
+# scipy ships a native C all-pairs Dijkstra, use it when available and
+# fall back on our own numba kernel otherwise.
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra as _csgraph_dijkstra
+except ImportError:
+    csr_matrix = None
+
 ########################################################################
 ####################### Program globals    #############################
 ########################################################################
@@ -154,205 +171,516 @@ def represent_network(network:tuple[routers: list[dict], machines: list[dict]],
         NOTE: make sure that the ids of the routers and the machines start at 0.
     """
 
-    # use the w flag to clear the file first
-    file = open("./network.dot", "w")
-
-    # this will be the accumulator that will be flushed to the file
-    content = ""
-
     # extract our data
     routers = network[0]
     machines = network[1]
 
-    if len(routers) == 0: 
+    if len(routers) == 0:
         print("network should have a non blank routers list")
-        file.close()
         return
 
-    # add the xdot leading markup 
-    content +="digraph network {\n" 
-    
+    # iterate the CSR adjacency directly instead of the dicts
+    soa = _get_soa(routers)
+    indptr, indices, weights = soa.indptr, soa.indices, soa.weights
+
+    # O(1) membership test instead of scanning the list for every edge
+    highlight = frozenset(tohighlight)
+
+    # source router of every CSR edge, so the edges flatten into one zip
+    src_ids = np.repeat(np.arange(len(routers)), np.diff(indptr))
+
+    edge_list = list(zip(src_ids.tolist(), indices.tolist(), weights.tolist()))
+    edge_set = {(u, v) for u, v, _ in edge_list}
+
+    # the CSR speaks in positions, the node names and the highlighted
+    # pairs speak in router ids
+    ids = soa.router_ids.tolist()
+
+    # our links are bidirectionnal, so (u, v) and (v, u) both show up in
+    # the CSR; draw each physical link once instead of two arrows, which
+    # halves the file size and the xdot layout work. Only the
+    # highlighted hops stay directed so the path reads in order.
+    lines = []
+    for u, v, w in edge_list:
+        u_id = ids[u]
+        v_id = ids[v]
+        if (u_id, v_id) in highlight:
+            lines.append(f'\tr_{u_id+1}->r_{v_id+1} [label ="{w}"] [color ="red"];')
+        elif (v_id, u_id) in highlight:
+            # the reverse direction already carries the highlight
+            continue
+        elif (v, u) in edge_set:
+            if u < v:   # keep only one of the two directions
+                lines.append(f'\tr_{u_id+1}->r_{v_id+1} [label ="{w}"] [dir ="none"];')
+        else:
+            lines.append(f'\tr_{u_id+1}->r_{v_id+1} [label ="{w}"];')
+
+    lines += [
+        f'\tm_{machine["id"]}->r_{nieghbor+1};'
+        for machine in machines
+        for nieghbor in machine["nieghbors"]     # nieghbor is a router_id:int
+    ]
+
+    # stream the content out in joined chunks instead of materializing
+    # one giant string first: peak memory stays bounded by the chunk
+    # size while the writes stay batched, and the large file buffering
+    # keeps the actual system calls rare.
+    chunk_size = 1024
+    with open("./network.dot", "w", buffering=1<<16) as file:
+        file.write("digraph network {\n")
+        for i in range(0, len(lines), chunk_size):
+            file.write("\n".join(lines[i:i+chunk_size]) + "\n")
+        file.write("}\n")
 
-    for router in routers:  
-        for nieghbor in router["nieghbors"]: 
-            # nieghbor is a tuple(router_id:int, cost:int)
-            content += "\tr_"+str(router["id"]+1) +"->r_"+str(nieghbor[0]+1)
-            content += ' [label ="'+str(nieghbor[1])+'"]'
-            if (router["id"], nieghbor[0]) in tohighlight: 
-                content += ' [color ="red"]'
+    return
+
+
+# sentinel for unreachable destinations. Kept below half of the int32
+# range so a cost addition on the sentinel can never overflow, and it
+# fits the int32 storage used by the kernels and the routing matrices.
+INF:Final[int] = 0x3FFFFFFF
 
 
-            content += ";\n"
-        
+def _build_csr(routers:list[dict], id_to_idx:dict[int, int])->tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+        @author: Massiles Ghernaout (github.com/MassiGy)
+
+        Flatten the routers nieghbors lists into a CSR adjacency:
+        the nieghbors of router u are indices[indptr[u]:indptr[u+1]]
+        with the matching link costs in weights at the same positions.
+
+        Three flat int32 arrays instead of a list of dicts of lists of
+        tuples, which is what the numba kernels below can chew on.
+
+        Nieghbor ids go through id_to_idx, so indices holds positions in
+        the routers list rather than raw ids and nothing below relies on
+        the ids being dense and 0-based anymore.
+    """
+    nieghbors_count = np.fromiter(
+        (len(router["nieghbors"]) for router in routers),
+        dtype=np.int32,
+        count=len(routers)
+    )
+    edges_count = int(nieghbors_count.sum())
+
+    indptr = np.zeros(len(routers)+1, dtype=np.int32)
+    np.cumsum(nieghbors_count, out=indptr[1:])
+
+    indices = np.fromiter(
+        (id_to_idx[nieghbor[0]] for router in routers for nieghbor in router["nieghbors"]),
+        dtype=np.int32,
+        count=edges_count
+    )
+    weights = np.fromiter(
+        (nieghbor[1] for router in routers for nieghbor in router["nieghbors"]),
+        dtype=np.int32,
+        count=edges_count
+    )
+    return indptr, indices, weights
+
+
+@njit("void(i4, i4[:], i4[:], i4[:], i4[:], i4[:])",
+      cache=True, boundscheck=False, no_cpython_wrapper=True)
+def _dijkstra_from(dest, indptr, indices, weights, dist, nxt):
+    """
+        Single-destination Dijkstra over the CSR adjacency, filling the
+        dist and nxt rows in place. The frontier is a manual binary
+        min-heap laid out in two flat int32 arrays since numba can not
+        jit heapq on tuples. Stale heap entries are skipped on pop
+        instead of being removed (lazy deletion), so the heap capacity
+        is bounded by the edge count.
+    """
+    capacity = indices.shape[0] + 1
+    heap_cost = np.empty(capacity, np.int32)
+    heap_node = np.empty(capacity, np.int32)
+
+    for i in range(dist.shape[0]):
+        dist[i] = INF
+        nxt[i] = -1
+
+    dist[dest] = 0
+    nxt[dest] = dest
+
+    heap_cost[0] = 0
+    heap_node[0] = dest
+    size = 1
+    settled = 0
+
+    while size > 0:
+        cost = heap_cost[0]
+        curr = heap_node[0]
+
+        # pop the root: move the last entry up front and sift it down
+        size -= 1
+        heap_cost[0] = heap_cost[size]
+        heap_node[0] = heap_node[size]
+        i = 0
+        while True:
+            left = 2*i + 1
+            if left >= size:
+                break
+            smallest = left
+            right = left + 1
+            if right < size and heap_cost[right] < heap_cost[left]:
+                smallest = right
+            if heap_cost[smallest] >= heap_cost[i]:
+                break
+            heap_cost[i], heap_cost[smallest] = heap_cost[smallest], heap_cost[i]
+            heap_node[i], heap_node[smallest] = heap_node[smallest], heap_node[i]
+            i = smallest
+
+        if cost > dist[curr]:
+            # stale heap entry, curr was already settled with a better cost
+            continue
+
+        # once every router is settled no relaxation can improve anything,
+        # so bail out instead of draining the remaining stale heap entries
+        settled += 1
+        if settled == dist.shape[0]:
+            break
+
+        if cost >= INF:
+            # never add on top of the sentinel, int32 would overflow
+            continue
+
+        for k in range(indptr[curr], indptr[curr+1]):
+            nieghbor = indices[k]
+            new_cost = cost + weights[k]
+
+            if new_cost < dist[nieghbor]:
+                dist[nieghbor] = new_cost
+
+                # going from nieghbor, curr is the gate towards the destination
+                nxt[nieghbor] = curr
+
+                # push (new_cost, nieghbor) and sift it up
+                i = size
+                heap_cost[i] = new_cost
+                heap_node[i] = nieghbor
+                size += 1
+                while i > 0:
+                    parent = (i-1) // 2
+                    if heap_cost[i] >= heap_cost[parent]:
+                        break
+                    heap_cost[i], heap_cost[parent] = heap_cost[parent], heap_cost[i]
+                    heap_node[i], heap_node[parent] = heap_node[parent], heap_node[i]
+                    i = parent
+
+
+@njit("Tuple((i4[:,:], i4[:,:]))(i4[:], i4[:], i4[:])",
+      parallel=True, cache=True, boundscheck=False)
+def _all_pairs(indptr, indices, weights):
+    """
+        Run one Dijkstra per destination over the CSR adjacency.
+        Row d of the returned matrices holds, for every router v, the
+        cost dist[d, v] and the best next hop nxt[d, v] for reaching d.
+
+        The destinations are embarrassingly parallel (each one only
+        writes its own row of dist / nxt), so prange spreads them over
+        the cores with no GIL in the way.
+    """
+    V = indptr.shape[0] - 1
+    dist = np.empty((V, V), np.int32)
+    nxt = np.empty((V, V), np.int32)
+
+    for d in prange(V):
+        _dijkstra_from(d, indptr, indices, weights, dist[d], nxt[d])
 
+    return dist, nxt
 
-    for machine in machines:
-        for nieghbor in machine["nieghbors"]: 
-            # nieghbor is a router_id:int
-            content += "\tm_"+str(machine["id"]) +"->r_"+str(nieghbor+1)
-            content += ";\n"
 
+@dataclass
+class Network:
+    """
+        @author: Massiles Ghernaout (github.com/MassiGy)
 
-    # add the xdot trailing markup 
-    content +="}\n" 
-    file.write(content) 
-    file.close()
-    return 
+        Structure-of-Arrays view of the routers list. Instead of a list
+        of dicts of lists of tuples (one boxed Python object per field),
+        the whole network lives in a handful of flat numpy arrays:
+        - router_ids, the id of each router by position, with
+          id_to_idx as the reverse mapping for the API boundaries.
+        - indptr / indices / weights, the CSR adjacency.
+        - routing_cost / routing_next_hop, the dense V x V routing
+          matrices where row d holds, for every router v, the total
+          cost and the best next hop for reaching destination d.
+
+        legacy_routers keeps a reference on the list of dicts this view
+        was built from, so callers can tell whether a cached instance
+        still matches thier input. The dict-based seed data and the
+        public procedures below are unchanged, they go through the
+        from_legacy / to_legacy adapters.
+    """
+    router_ids: np.ndarray
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+    routing_next_hop: np.ndarray = None
+    routing_cost: np.ndarray = None
+    legacy_routers: list = None
+    id_to_idx: dict = None
+
+    @property
+    def hop_dtype(self)->type:
+        """
+            narrowest integer type able to hold every router position:
+            int16 covers networks up to 32k routers and halves the
+            memory (and cache) footprint of the dense next-hop matrix,
+            int32 takes over beyond that. Costs stay int32 since they
+            accumulate. Callers converting entries for the dict-based
+            API wrap them with int() at the boundary only.
+        """
+        return np.int16 if len(self.router_ids) < np.iinfo(np.int16).max else np.int32
+
+    @classmethod
+    def from_legacy(cls, routers:list[dict])->"Network":
+        """ flatten the dict-based routers list into the arrays. """
+        id_to_idx = {router["id"]: i for i, router in enumerate(routers)}
+        indptr, indices, weights = _build_csr(routers, id_to_idx)
+        router_ids = np.fromiter(
+            (router["id"] for router in routers),
+            dtype=np.int32,
+            count=len(routers)
+        )
+        return cls(router_ids, indptr, indices, weights,
+                   legacy_routers=routers, id_to_idx=id_to_idx)
+
+    def setup_routing(self)->None:
+        """
+            fill the dense routing matrices, in one scipy.sparse.csgraph
+            call when scipy is installed (the whole batch runs in native
+            C and releases the GIL), through our numba kernel otherwise.
+
+            Since we run Dijkstra from each destination d over
+            bidirectionnal links, the predecessor of v on the path
+            d -> v is exactly the best next hop of v towards d.
+        """
+        if csr_matrix is None:
+            dist, nxt = _all_pairs(self.indptr, self.indices, self.weights)
+            self.routing_cost = dist
+            self.routing_next_hop = nxt.astype(self.hop_dtype)
+            return
+
+        V = len(self.router_ids)
+        graph = csr_matrix((self.weights, self.indices, self.indptr), shape=(V, V))
+        dist, predecessors = _csgraph_dijkstra(graph, directed=True, return_predecessors=True)
+
+        nxt = predecessors.astype(np.int32)
+        # scipy marks the source and unreachable nodes with -9999,
+        # normalize to our conventions: self next hop and -1
+        nxt[nxt < 0] = -1
+        np.fill_diagonal(nxt, np.arange(V, dtype=np.int32))
+
+        self.routing_cost = np.where(np.isinf(dist), INF, dist).astype(np.int32)
+        self.routing_next_hop = nxt.astype(self.hop_dtype)
+
+    def to_legacy(self)->None:
+        """
+            copy the routing matrices back into the routing_table dicts.
+
+            Each entry is bounded: the best (next_hop, total_cost) pair
+            sits at index 0, followed by at most one alternative next
+            hop to fall back on when the primary one is down. Dominated
+            alternatives are never accumulated.
+        """
+        # hoist the arrays into plain python lists once, so the loops
+        # below do single list subscripts instead of repeated numpy
+        # scalar indexing plus int() boxing on every edge
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        weights = self.weights.tolist()
+
+        # the matrices are indexed by position, the dicts speak in ids
+        ids = self.router_ids.tolist()
+
+        for d in range(len(self.legacy_routers)):
+            dest_id = ids[d]
+            nxt_row = self.routing_next_hop[d].tolist()
+            dist_row = self.routing_cost[d].tolist()
+
+            for r, router in enumerate(self.legacy_routers):
+                best_pos = nxt_row[r]
+                best_hop = ids[best_pos] if best_pos != -1 else -1
+                entry = [(best_hop, dist_row[r])]
+
+                if r != d and best_pos != -1:
+                    # the fallback is the best nieghbor besides the primary hop
+                    alt_pos = -1
+                    alt_cost = INF
+                    for k in range(indptr[r], indptr[r+1]):
+                        n = indices[k]
+                        if n == best_pos:
+                            continue
+                        cost = weights[k] + dist_row[n]
+                        if cost < alt_cost:
+                            alt_pos = n
+                            alt_cost = cost
+                    if alt_pos != -1 and alt_cost < INF:
+                        entry.append((ids[alt_pos], alt_cost))
+
+                router["routing_table"][dest_id] = entry
+
+
+# the Structure-of-Arrays view shared by the procedures below, rebuilt
+# by setup_routing_tables and reused as long as the routers list is the same.
+# The lock serializes the check-then-assign below against the publish in
+# setup_routing_tables, since the main script overlaps the two in threads:
+# without it, a freshly built view (no routing matrices yet) could clobber
+# an already-routed one.
+_soa:Network = None
+_soa_lock = Lock()
+
+
+def _get_soa(routers:list[dict])->Network:
+    global _soa
+    with _soa_lock:
+        if _soa is None or _soa.legacy_routers is not routers:
+            _soa = Network.from_legacy(routers)
+            # a different routers list means the memoized paths are stale too
+            _find_best_route_ids.cache_clear()
+        return _soa
 
 
 # declare a procedure to calculate our routing tables
-def setup_routing_tables(routers:list[dict])-> None: 
-    """ 
+def setup_routing_tables(routers:list[dict])-> None:
+    """
         @author: Massiles Ghernaout (github.com/MassiGy)
 
-        NOTE: I've been able to write this algorithm from scratch 
+        NOTE: I've been able to write this algorithm from scratch
         thanks to Pr. Geoffrey Messier and his lecture about Routing
         Algorithms.
         Link: https://www.youtube.com/watch?v=Ko7BChxlAFU&list=PL7sWxFnBVJLXZdk6_kPjcfOJBT-H1VSG1&index=19
 
 
-        we are going to iterate through the routers list, and foreach 
+        we are going to iterate through the routers list, and foreach
         router we are going to setup the routing table.
 
-        The routing table is a dictionary mapping each destination to 
-        a list of routers which represent the next hops to follow, this
-        list will be in ascending order regarding the cost of each hop.
+        The routing table is a dictionary mapping each destination to
+        the best next hop to follow with its total cost.
 
-        To do so, we'll use the Bellman-Ford algorithm. The steps are simple:
+        To do so, we'll use the Dijkstra algorithm instead of the previous
+        Bellman-Ford style relaxation sweeps. The steps are simple:
+        - build the CSR adjacency arrays of the network once.
         - set a destination.
-        - set the cost for reaching the destination from itself to 0.
-        - set the seed cost of all the routers to that destination to be infinity.
-        - going from the destination, update the routing tables of its nieghbors to 
-          indicate the correct cost that can be found in thier nieghbors list. 
-        - iterate through all the routers of the network.
-        - for each router, update the routing table entry indicating how to reach 
-          destination by asking its nieghbors for a better next hop ( lower cost )
-        - if some nieghbors do not know how to reach the destination in the first
-          iteration pass, iterate over again from the start.
-        
-        - do this for every router out there as a destination. 
-
-        NOTE: The only issue with this algorithm is that it does not indicate 
-        the list of fallback routers to use if the primary (best next hop) one
-        is down. So as Pr. Geoffrey Messier pointed out in the video, the algorithm
-        should be re-executed periodicaly to keep the routing table reliable, thus
-        making the routing and the network self-healing.
+        - run Dijkstra starting from the destination over the network,
+          our links are bidirectionnal so going from the destination or
+          towards it gives the same distances.
+        - while relaxing an edge (u -> v), record u as the best next hop
+          of v for reaching the destination.
+        - once the frontier heap is drained, every router knows its best
+          next hop and total cost towards the destination.
+
+        - do this for every router out there as a destination.
+
+        The per-destination Dijkstras run inside the _all_pairs numba
+        kernel over the flat CSR arrays, so the hot relaxation loop is
+        compiled machine code instead of interpreted dict lookups and
+        tuple boxing. This procedure only flattens the routers into CSR,
+        calls the kernel, and copies the resulting dist / next hop
+        matrices back into the routing table dicts.
+
+        NOTE: Dijkstra alone does not indicate the fallback routers to
+        use if the primary (best next hop) one is down, so to_legacy
+        adds at most one alternative next hop per entry (best one first,
+        always at index 0). Still, as Pr. Geoffrey Messier pointed out
+        in the video, the algorithm should be re-executed periodicaly to
+        keep the routing table reliable, thus making the routing and the
+        network self-healing.
     """
 
-    if len(routers) == 0: 
+    if len(routers) == 0:
         print("routers list should not be blank for setting up the routing tables.")
         return
 
-    infinity = pow(10,10)
-    # for _ in routers: 
-    for router in routers: 
-        # reset the routing table
-
-        # set the first entry, indicating that to reach self the cost==0 
-        router["routing_table"].__setitem__(router["id"], [(router["id"], 0)])
-
-
-        # let destination to be r 
-        destination = router
-        
-        # start the seed as Bellman-Ford algorithm suggest (start at a cost of infinity)
-        for _r in routers: 
-            if _r != destination:
-                _r["routing_table"].__setitem__(destination["id"], [(-1, infinity)])
-
-        # update the values on the routers that have destination as a nieghbor
-        destination_nieghbors = destination["nieghbors"]    # connections are bidirectionnal
-
-        for _r in destination_nieghbors: 
-            # _r is a tuple of (router_id:int, cost:id)
-            cost_to_destination=infinity
-
-            # find the cost to destination going from _r
-            for n in routers[_r[0]]["nieghbors"]: 
-                if n[0] == destination["id"]:
-                    cost_to_destination = n[1]
-                    break
-
-            routers[_r[0]]["routing_table"][destination["id"]].append(
-                (
-                    destination["id"],
-                    cost_to_destination
-                )
-            )
-
-        for _ in routers: 
-            # we iterate quadratically since at the end of a cycle of iterations, 
-            # we can end up with routers that do not know how to reach the destination
-            # since they need to wait for thier nieghbors to know that informations first. 
-            # Besides, iterating quadratically can optimize the routing tables, since we can 
-            # have a situation where a router find out that one of its nieghbors has a better
-            # cost compared to its own, since its own cost was calculated earlier. 
-
-            for r in routers: 
-                if r == destination: 
-                    continue
-
-                # now, starting from our start neighbors,
-                # we need to ask each neighbors if there is a better route 
-                # for reaching the destination and we only update our routing
-                # table if there is a better route then the one we've registered. 
-                start = r
-                nieghbors = start["nieghbors"]
-                
-                for nieghbor in nieghbors: 
-                    # nieghbor is a tuple of (router_id:int, cost:int)
-
-                    n = routers[nieghbor[0]]
-                    nieghbor_to_dest_best_hop = n["routing_table"][destination["id"]][-1]
-                    nieghbor_to_destination_cost = nieghbor_to_dest_best_hop[1]
-
-                    if nieghbor_to_destination_cost == infinity: 
-                        continue
-                    
-                    start_to_nieghbor_cost = nieghbor[1]
-
-                    start_to_destination_cost = start["routing_table"][destination["id"]][-1][1]
-                    if  start_to_nieghbor_cost + nieghbor_to_destination_cost < start_to_destination_cost:
-                        # we append instead of overriding to keep track of the alternative routes in case 
-                        # where the best next hop is dead or subjected to intense traffic
-                        # this means that the best next hop will be at the end of the list
-
-                        start["routing_table"][destination["id"]].append(
-                                (
-                                    nieghbor[0],
-                                    start_to_nieghbor_cost +nieghbor_to_destination_cost
-                                )
-                        )
+    # flatten the routers once, then let the compiled kernel do the work.
+    # Build, route and flush on a local, and only publish the finished
+    # view: the global is shared with a possibly concurrent _get_soa.
+    soa = Network.from_legacy(routers)
+    soa.setup_routing()
+
+    # flush the computed matrices into the routing table dicts
+    soa.to_legacy()
 
+    global _soa
+    with _soa_lock:
+        _soa = soa
+        # the routing tables changed, the memoized paths are stale now
+        _find_best_route_ids.cache_clear()
     return
 
 
+@lru_cache(maxsize=None)
+def _find_best_route_ids(src_id:int, dest_id:int)->tuple[int, ...]:
+    """
+        @author: Massiles Ghernaout (github.com/MassiGy)
+
+        Memoized path reconstruction, keyed on plain (src_id, dest_id)
+        ints (dicts and lists are not hashable so they can not be cache
+        keys). The walk is a tight loop over one row of the dense
+        routing_next_hop matrix, no dict lookups involved.
+
+        The path buffer is preallocated and the walk is capped at V
+        steps: a loop-free path can not revisit a router, so needing
+        more hops than routers means the routing table has a cycle, and
+        we bail out instead of spinning (and growing) forever.
+
+        NOTE: setup_routing_tables calls cache_clear() on this whenever
+        the routing tables are recomputed, since the cached paths would
+        be stale otherwise.
+    """
+    if src_id == dest_id:
+        return (dest_id,)
+
+    # translate the ids into positions once, the walk itself is positional
+    idx = _soa.id_to_idx
+    ids = _soa.router_ids.tolist()
+    V = len(ids)
+    dest_pos = idx[dest_id]
+
+    # row dest_pos holds the best next hop of every router towards dest_id
+    next_hops = _soa.routing_next_hop[dest_pos]
+
+    path = [0] * V
+    path[0] = src_id
+    n = 1
+
+    curr = int(next_hops[idx[src_id]])
+    while curr != dest_pos:
+        if curr == -1:
+            print("no route from", src_id, "to", dest_id, "in the routing tables.")
+            return ()
+        if n >= V - 1:
+            print("cycle detected in the routing tables between", src_id, "and", dest_id, ".")
+            return ()
+        path[n] = ids[curr]
+        n += 1
+        curr = int(next_hops[curr])
+
+    path[n] = dest_id
+    return tuple(path[:n+1])
+
+
 # declare a procedure for finding the best route path
 def find_best_route(routers:list[dict], src:dict, dest:dict)->list[int]:
-    """ 
+    """
         @author: Massiles Ghernaout (github.com/MassiGy)
 
-        Going from the routing tables, it is really easy to 
+        Going from the routing tables, it is really easy to
         find a path, it is just a matter of jumping from point
-        to point starting from the destination entry in the src 
-        routing table. All ways look for the destination entry, 
+        to point starting from the destination entry in the src
+        routing table. All ways look for the destination entry,
         and follow that router.
-    """
-    path = []
 
-    if src not in routers or dest not in routers: 
+        This is a thin wrapper around _find_best_route_ids so that
+        repeated queries for the same (src, dest) pair are O(1) cache
+        lookups after the first walk.
+    """
+    if src not in routers or dest not in routers:
         print("source and destination routers should be in the routers list to find a path.")
 
-    path.append(src["id"])
-    
-    curr = src["routing_table"][dest["id"]][0][0]
-    while curr != dest["id"]: 
-        path.append(curr)
-        curr = routers[curr]["routing_table"][dest["id"]][0][0]
+    # make sure the cached SoA view matches the given routers list
+    _get_soa(routers)
 
-    path.append(dest["id"])
-    
-    return path
+    return list(_find_best_route_ids(src["id"], dest["id"]))
 
 
 
@@ -365,10 +693,14 @@ def find_best_route(routers:list[dict], src:dict, dest:dict)->list[int]:
 ####################### Program execution #############################
 ########################################################################
 
-represent_network(network=network)
-
-# create the routing tables
-setup_routing_tables(routers=routers)
+# drawing the network and creating the routing tables are independent
+# (both only read the seed data), so overlap them: the .dot writing is
+# IO-bound and the all-pairs batch runs in native code off the GIL.
+with ThreadPoolExecutor(max_workers=2) as executor:
+    drawing = executor.submit(represent_network, network)
+    routing = executor.submit(setup_routing_tables, routers)
+    drawing.result()
+    routing.result()
 
 # print out the routing tables
 
@@ -380,10 +712,7 @@ for router in routers:
         entry=""
         entry += "\t"+ str(nieghbor_id+1) + ":"
 
-        # sort by cost
-        hops.sort(key=lambda x:x[1])
-        
-        # print the best route
+        # print the best route, entries hold the single best hop already
         entry +=" "+str(hops[0][0]+1)
 
 